@@ -0,0 +1,69 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled CSV row conversion for ingest_to_sqlite.
+
+Build in place with:
+    cythonize -i _fast_ingest.pyx
+
+ingest_to_sqlite falls back to its pure-Python row loop when this module
+has not been built.
+"""
+from cpython.mem cimport PyMem_Malloc, PyMem_Free
+
+cdef enum Kind:
+    TEXT = 0
+    INTEGER = 1
+    REAL = 2
+
+cdef dict KINDS = {'TEXT': TEXT, 'INTEGER': INTEGER, 'REAL': REAL}
+
+
+cdef inline object _convert(int kind, str value):
+    # Same rules as ingest_to_sqlite's _to_int/_to_real/_to_text
+    value = value.strip()
+    if not value:
+        return None
+    if kind == TEXT:
+        return value
+    try:
+        if kind == INTEGER:
+            return int(float(value))
+        return float(value)
+    except Exception:
+        return None
+
+
+def iter_batches(reader, fields, Py_ssize_t width, Py_ssize_t batch_size):
+    """Yield lists of up to `batch_size` converted row tuples.
+
+    `fields` holds one (csv_position, sqlite_type) pair per target column;
+    rows shorter than `width` are padded with empty strings.
+    """
+    cdef Py_ssize_t n = len(fields)
+    cdef Py_ssize_t j
+    cdef Py_ssize_t *idx = <Py_ssize_t *> PyMem_Malloc(n * sizeof(Py_ssize_t))
+    cdef int *kinds = <int *> PyMem_Malloc(n * sizeof(int))
+    cdef list row
+    cdef list batch = []
+    if idx is NULL or kinds is NULL:
+        PyMem_Free(idx)
+        PyMem_Free(kinds)
+        raise MemoryError()
+    try:
+        for j, (pos, col_type) in enumerate(fields):
+            idx[j] = pos
+            kinds[j] = KINDS.get(col_type, TEXT)
+        for row in reader:
+            if not row:
+                continue
+            if len(row) < width:
+                row.extend([''] * (width - len(row)))
+            batch.append(tuple([_convert(kinds[j], <str>row[idx[j]]) for j in range(n)]))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    finally:
+        PyMem_Free(idx)
+        PyMem_Free(kinds)
@@ -1,7 +1,7 @@
 import csv
 import random
-import uuid
 from datetime import datetime, timedelta
+from multiprocessing import Pool
 import os
 
 
@@ -11,7 +11,26 @@ def ensure_dir(path):
         os.makedirs(d, exist_ok=True)
 
 
-def generate_customers(n=100):
+CUSTOMER_FIELDS = ["customer_id", "name", "email", "phone", "address", "created_at"]
+PRODUCT_FIELDS = ["product_id", "name", "category", "price", "stock", "created_at"]
+ORDER_FIELDS = ["order_id", "customer_id", "product_id", "quantity", "order_date", "status", "subtotal", "shipping", "total"]
+PAYMENT_FIELDS = ["payment_id", "order_id", "amount", "method", "status", "payment_date"]
+REVIEW_FIELDS = ["review_id", "product_id", "customer_id", "rating", "review_text", "review_date"]
+
+
+def _randints(rnd, a, b, n):
+    """Draw `n` integers uniformly from [a, b] in one call."""
+    return rnd.choices(range(a, b + 1), k=n)
+
+
+def _uniforms(rnd, a, b, n):
+    """Draw `n` floats uniformly from [a, b]."""
+    uniform = rnd.uniform
+    return [uniform(a, b) for _ in range(n)]
+
+
+def generate_customers(writer, n=100, seed=None):
+    """Write customer rows to `writer`; return the customer ids."""
     first_names = ["James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda", "William", "Elizabeth"]
     last_names = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez"]
     domains = ["example.com", "email.com", "shopnow.com", "mail.com"]
@@ -19,102 +38,148 @@ def generate_customers(n=100):
     cities = ["Springfield", "Rivertown", "Greenville", "Fairview"]
     states = ["CA", "NY", "TX", "WA", "FL"]
 
-    rows = []
-    for i in range(1, n + 1):
-        cid = f"CUST{i:04d}"
-        fn = random.choice(first_names)
-        ln = random.choice(last_names)
-        name = f"{fn} {ln}"
-        email = f"{fn.lower()}.{ln.lower()}{i}@{random.choice(domains)}"
-        phone = f"+1-{random.randint(200, 999)}-{random.randint(200, 999)}-{random.randint(1000, 9999)}"
-        created = datetime.now() - timedelta(days=random.randint(1, 2000))
-        address = f"{random.randint(100, 9999)} {random.choice(streets)} St, {random.choice(cities)}, {random.choice(states)}"
-        rows.append({
-            "customer_id": cid,
-            "name": name,
-            "email": email,
-            "phone": phone,
-            "address": address,
-            "created_at": created.isoformat()
-        })
-    return rows
-
-
-def generate_products(n=100):
+    rnd = random.Random(seed)
+    choices = rnd.choices
+
+    # draw each column for all rows up front
+    fns = choices(first_names, k=n)
+    lns = choices(last_names, k=n)
+    doms = choices(domains, k=n)
+    phone_a = _randints(rnd, 200, 999, n)
+    phone_b = _randints(rnd, 200, 999, n)
+    phone_c = _randints(rnd, 1000, 9999, n)
+    created_days = _randints(rnd, 1, 2000, n)
+    house_nos = _randints(rnd, 100, 9999, n)
+    strs = choices(streets, k=n)
+    cits = choices(cities, k=n)
+    sts = choices(states, k=n)
+
+    now = datetime.now()
+    writerow = writer.writerow
+    writerow(CUSTOMER_FIELDS)
+    customer_ids = []
+    for j in range(n):
+        cid = f"CUST{j + 1:04d}"
+        writerow((
+            cid,
+            f"{fns[j]} {lns[j]}",
+            f"{fns[j].lower()}.{lns[j].lower()}{j + 1}@{doms[j]}",
+            f"+1-{phone_a[j]}-{phone_b[j]}-{phone_c[j]}",
+            f"{house_nos[j]} {strs[j]} St, {cits[j]}, {sts[j]}",
+            (now - timedelta(days=created_days[j])).isoformat()
+        ))
+        customer_ids.append(cid)
+    return customer_ids
+
+
+def generate_products(writer, n=100, seed=None):
+    """Write product rows to `writer`; return (product_id, price) pairs."""
     categories = ["Electronics", "Books", "Home", "Toys", "Clothing", "Sports", "Beauty"]
     adjectives = ["Portable", "Advanced", "Smart", "Eco", "Premium", "Compact", "Durable", "Classic"]
     items = ["Headphones", "Lamp", "Backpack", "Blender", "Watch", "Camera", "Mug", "Sneakers", "Jacket", "Game"]
 
-    rows = []
-    for i in range(1, n + 1):
-        pid = f"PROD{i:04d}"
-        name = f"{random.choice(adjectives)} {random.choice(items)}"
-        category = random.choice(categories)
-        price = round(random.uniform(5.0, 499.99), 2)
-        stock = random.randint(0, 500)
-        created = datetime.now() - timedelta(days=random.randint(1, 1500))
-        rows.append({
-            "product_id": pid,
-            "name": name,
-            "category": category,
-            "price": price,
-            "stock": stock,
-            "created_at": created.isoformat()
-        })
-    return rows
-
-
-def generate_orders(n=100, customers=None, products=None):
+    rnd = random.Random(seed)
+    choices = rnd.choices
+
+    adjs = choices(adjectives, k=n)
+    its = choices(items, k=n)
+    cats = choices(categories, k=n)
+    prices = _uniforms(rnd, 5.0, 499.99, n)
+    stocks = _randints(rnd, 0, 500, n)
+    created_days = _randints(rnd, 1, 1500, n)
+
+    now = datetime.now()
+    writerow = writer.writerow
+    writerow(PRODUCT_FIELDS)
+    products = []
+    for j in range(n):
+        pid = f"PROD{j + 1:04d}"
+        price = round(prices[j], 2)
+        writerow((
+            pid,
+            f"{adjs[j]} {its[j]}",
+            cats[j],
+            price,
+            stocks[j],
+            (now - timedelta(days=created_days[j])).isoformat()
+        ))
+        products.append((pid, price))
+    return products
+
+
+def generate_orders(writer, n=100, customer_ids=None, products=None, seed=None):
+    """Write order rows to `writer`; return (order_id, order_date, total) triples."""
     statuses = ["pending", "processing", "shipped", "delivered", "cancelled"]
-    rows = []
-    for i in range(1, n + 1):
-        oid = f"ORD{i:05d}"
-        cust = random.choice(customers)["customer_id"]
-        product = random.choice(products)
-        qty = random.randint(1, 5)
-        order_date = datetime.now() - timedelta(days=random.randint(1, 365))
-        subtotal = round(product["price"] * qty, 2)
-        shipping = 0 if subtotal > 50 else round(random.uniform(3.99, 9.99), 2)
+
+    rnd = random.Random(seed)
+    choices = rnd.choices
+
+    custs = choices(customer_ids, k=n)
+    prods = choices(products, k=n)
+    qtys = _randints(rnd, 1, 5, n)
+    order_days = _randints(rnd, 1, 365, n)
+    shipping_fees = _uniforms(rnd, 3.99, 9.99, n)
+    sts = choices(statuses, weights=[10, 20, 30, 30, 10], k=n)
+
+    now = datetime.now()
+    writerow = writer.writerow
+    writerow(ORDER_FIELDS)
+    orders = []
+    for j in range(n):
+        oid = f"ORD{j + 1:05d}"
+        product_id, price = prods[j]
+        order_date = now - timedelta(days=order_days[j])
+        subtotal = round(price * qtys[j], 2)
+        shipping = 0 if subtotal > 50 else round(shipping_fees[j], 2)
         total = round(subtotal + shipping, 2)
-        status = random.choices(statuses, weights=[10, 20, 30, 30, 10])[0]
-        rows.append({
-            "order_id": oid,
-            "customer_id": cust,
-            "product_id": product["product_id"],
-            "quantity": qty,
-            "order_date": order_date.isoformat(),
-            "status": status,
-            "subtotal": subtotal,
-            "shipping": shipping,
-            "total": total
-        })
-    return rows
-
-
-def generate_payments(orders):
+        writerow((
+            oid,
+            custs[j],
+            product_id,
+            qtys[j],
+            order_date.isoformat(),
+            sts[j],
+            subtotal,
+            shipping,
+            total
+        ))
+        orders.append((oid, order_date, total))
+    return orders
+
+
+def generate_payments(writer, orders, seed=None):
+    """Write one payment row per (order_id, order_date, total) in `orders`."""
     methods = ["credit_card", "paypal", "bank_transfer", "apple_pay"]
     statuses = ["paid", "pending", "failed"]
-    rows = []
-    for o in orders:
-        pid = f"PAY-{uuid.uuid4().hex[:8]}"
-        order_id = o["order_id"]
-        amt = o["total"] if random.random() > 0.05 else round(o["total"] * random.uniform(0.3, 0.9), 2)
-        method = random.choice(methods)
-        status = random.choices(statuses, weights=[85, 10, 5])[0]
-        order_dt = datetime.fromisoformat(o["order_date"])
-        pay_dt = order_dt + timedelta(days=random.randint(0, 7))
-        rows.append({
-            "payment_id": pid,
-            "order_id": order_id,
-            "amount": amt,
-            "method": method,
-            "status": status,
-            "payment_date": pay_dt.isoformat()
-        })
-    return rows
-
-
-def generate_reviews(n=100, customers=None, products=None):
+
+    rnd = random.Random(seed)
+    choices = rnd.choices
+
+    n = len(orders)
+    rand = rnd.random
+    partial_draws = [rand() for _ in range(n)]
+    partial_fracs = _uniforms(rnd, 0.3, 0.9, n)
+    meths = choices(methods, k=n)
+    sts = choices(statuses, weights=[85, 10, 5], k=n)
+    pay_days = _randints(rnd, 0, 7, n)
+    id_bytes = rnd.randbytes(4 * n)
+
+    writerow = writer.writerow
+    writerow(PAYMENT_FIELDS)
+    for j, (order_id, order_date, total) in enumerate(orders):
+        amt = total if partial_draws[j] > 0.05 else round(total * partial_fracs[j], 2)
+        writerow((
+            f"PAY-{id_bytes[4 * j:4 * j + 4].hex()}",
+            order_id,
+            amt,
+            meths[j],
+            sts[j],
+            (order_date + timedelta(days=pay_days[j])).isoformat()
+        ))
+
+
+def generate_reviews(writer, n=100, customer_ids=None, products=None, seed=None):
+    """Write review rows to `writer`."""
     sample_texts = [
         "Excellent product, highly recommend!",
         "Good value for money.",
@@ -125,55 +190,56 @@ def generate_reviews(n=100, customers=None, products=None):
         "Too expensive for what it offers.",
         "Five stars!"
     ]
-    rows = []
-    for i in range(1, n + 1):
-        rid = f"REV{i:05d}"
-        customer_id = random.choice(customers)["customer_id"]
-        product = random.choice(products)
-        rating = random.randint(1, 5)
-        text = random.choice(sample_texts)
-        review_date = datetime.now() - timedelta(days=random.randint(1, 800))
-        rows.append({
-            "review_id": rid,
-            "product_id": product["product_id"],
-            "customer_id": customer_id,
-            "rating": rating,
-            "review_text": text,
-            "review_date": review_date.isoformat()
-        })
-    return rows
-
-
-def write_csv(path, fieldnames, rows):
+
+    rnd = random.Random(seed)
+    choices = rnd.choices
+
+    custs = choices(customer_ids, k=n)
+    prods = choices(products, k=n)
+    ratings = _randints(rnd, 1, 5, n)
+    texts = choices(sample_texts, k=n)
+    review_days = _randints(rnd, 1, 800, n)
+
+    now = datetime.now()
+    writerow = writer.writerow
+    writerow(REVIEW_FIELDS)
+    for j in range(n):
+        writerow((
+            f"REV{j + 1:05d}",
+            prods[j][0],
+            custs[j],
+            ratings[j],
+            texts[j],
+            (now - timedelta(days=review_days[j])).isoformat()
+        ))
+
+
+def _generate_and_write(seed, path, generate, *args, **kwargs):
+    """Pool task: stream one table into its CSV; return what dependent tables need."""
     ensure_dir(path)
     with open(path, "w", newline='', encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        for r in rows:
-            writer.writerow(r)
+        # distinct seed per task/worker so tables don't share draws
+        return generate(csv.writer(f), *args, seed=seed ^ os.getpid(), **kwargs)
 
 
 def main(output_dir="."):
-    customers = generate_customers(100)
-    products = generate_products(100)
-    orders = generate_orders(100, customers=customers, products=products)
-    payments = generate_payments(orders)
-    reviews = generate_reviews(100, customers=customers, products=products)
-
-    write_csv(os.path.join(output_dir, "customers.csv"),
-              ["customer_id", "name", "email", "phone", "address", "created_at"], customers)
-
-    write_csv(os.path.join(output_dir, "products.csv"),
-              ["product_id", "name", "category", "price", "stock", "created_at"], products)
-
-    write_csv(os.path.join(output_dir, "orders.csv"),
-              ["order_id", "customer_id", "product_id", "quantity", "order_date", "status", "subtotal", "shipping", "total"], orders)
-
-    write_csv(os.path.join(output_dir, "payments.csv"),
-              ["payment_id", "order_id", "amount", "method", "status", "payment_date"], payments)
-
-    write_csv(os.path.join(output_dir, "reviews.csv"),
-              ["review_id", "product_id", "customer_id", "rating", "review_text", "review_date"], reviews)
+    base_seed = random.getrandbits(64)
+
+    def task(i, name, generate, *args, **kwargs):
+        path = os.path.join(output_dir, name)
+        return pool.apply_async(_generate_and_write, (base_seed + i, path, generate) + args, kwargs)
+
+    # orders and reviews need customers + products; payments need orders
+    with Pool(2) as pool:
+        customers_res = task(1, "customers.csv", generate_customers, 100)
+        products_res = task(2, "products.csv", generate_products, 100)
+        customer_ids, products = customers_res.get(), products_res.get()
+
+        orders_res = task(3, "orders.csv", generate_orders, 100, customer_ids=customer_ids, products=products)
+        reviews_res = task(4, "reviews.csv", generate_reviews, 100, customer_ids=customer_ids, products=products)
+        payments_res = task(5, "payments.csv", generate_payments, orders_res.get())
+        reviews_res.get()
+        payments_res.get()
 
     print("Generated: customers.csv, products.csv, orders.csv, payments.csv, reviews.csv")
 
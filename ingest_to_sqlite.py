@@ -1,6 +1,8 @@
 """
 Ingest CSV files into SQLite `ecommerce.db`.
 Creates tables (DROP IF EXISTS) and bulk inserts rows from the CSV files.
+Each CSV is loaded in parallel into a scratch tmp_<table>.db, then merged
+into the main database in a single transaction.
 
 Run:
     python d:\\Desktop\\aaa\\ingest_to_sqlite.py
@@ -9,12 +11,28 @@ Run:
 import sqlite3
 import csv
 import os
+from multiprocessing import Pool
 from typing import Dict
 
+try:
+    # Optional compiled row conversion; see _fast_ingest.pyx for build steps.
+    from _fast_ingest import iter_batches as _fast_iter_batches
+except ImportError:
+    _fast_iter_batches = None
+
 WORKDIR = os.path.dirname(__file__) or '.'
 DB_PATH = os.path.join(WORKDIR, 'ecommerce.db')
 
+# Rows handed to each executemany call during bulk load.
+BATCH_SIZE = 10000
+# Batches up to this many rows go through one multi-row INSERT instead
+# (SQLite's default SQLITE_MAX_COMPOUND_SELECT)...
+MULTI_ROW_MAX = 500
+# ...as long as they stay under the bound-parameter limit of older SQLite builds.
+MAX_VARIABLES = 999
+
 # Define schemas for each table. Use SQLite types.
+# Indexes are (name, columns, unique) and are built after all rows are loaded.
 SCHEMAS = {
     'customers.csv': {
         'table': 'customers',
@@ -25,6 +43,9 @@ SCHEMAS = {
             ('phone', 'TEXT'),
             ('address', 'TEXT'),
             ('created_at', 'TEXT')
+        ],
+        'indexes': [
+            ('idx_customers_customer_id', ['customer_id'], False)
         ]
     },
     'products.csv': {
@@ -36,6 +57,9 @@ SCHEMAS = {
             ('price', 'REAL'),
             ('stock', 'INTEGER'),
             ('created_at', 'TEXT')
+        ],
+        'indexes': [
+            ('idx_products_product_id', ['product_id'], False)
         ]
     },
     'orders.csv': {
@@ -50,6 +74,11 @@ SCHEMAS = {
             ('subtotal', 'REAL'),
             ('shipping', 'REAL'),
             ('total', 'REAL')
+        ],
+        'indexes': [
+            ('idx_orders_order_id', ['order_id'], False),
+            ('idx_orders_customer_id', ['customer_id'], False),
+            ('idx_orders_product_id', ['product_id'], False)
         ]
     },
     'payments.csv': {
@@ -61,6 +90,9 @@ SCHEMAS = {
             ('method', 'TEXT'),
             ('status', 'TEXT'),
             ('payment_date', 'TEXT')
+        ],
+        'indexes': [
+            ('idx_payments_order_id', ['order_id'], False)
         ]
     },
     'reviews.csv': {
@@ -72,40 +104,91 @@ SCHEMAS = {
             ('rating', 'INTEGER'),
             ('review_text', 'TEXT'),
             ('review_date', 'TEXT')
+        ],
+        'indexes': [
+            ('idx_reviews_review_id', ['review_id'], False),
+            ('idx_reviews_customer_product', ['customer_id', 'product_id'], False)
         ]
     }
 }
 
 
+def _to_int(value: str):
+    if not value:
+        return None
+    try:
+        return int(float(value))
+    except Exception:
+        return None
+
+
+def _to_real(value: str):
+    if not value:
+        return None
+    try:
+        return float(value)
+    except Exception:
+        return None
+
+
+def _to_text(value: str):
+    # For TEXT, return the string as-is
+    return value if value else None
+
+
+# Per-type converters, resolved once per column so the row loop does no type dispatch.
+CONVERTERS = {
+    'INTEGER': _to_int,
+    'REAL': _to_real,
+    'TEXT': _to_text,
+}
+
+
 def convert_value(col_type: str, value: str):
     """Convert CSV string to appropriate Python value for SQLite insertion."""
-    if value is None or value == '':
-        return None
-    if col_type == 'INTEGER':
-        try:
-            return int(float(value))
-        except Exception:
-            return None
-    if col_type == 'REAL':
-        try:
-            return float(value)
-        except Exception:
-            return None
-    # For TEXT and all else, return the string as-is
-    return value
+    return CONVERTERS.get(col_type, _to_text)(value)
+
+
+def chunked(it, n: int):
+    """Yield lists of up to `n` items from iterable `it`."""
+    buf = []
+    for item in it:
+        buf.append(item)
+        if len(buf) >= n:
+            yield buf
+            buf = []
+    if buf:
+        yield buf
+
+
+def multi_row_insert(conn: sqlite3.Connection, table: str, col_names: list, rows: list):
+    """Insert `rows` with a single INSERT ... VALUES (...),(...) statement."""
+    ph = '(' + ','.join(['?'] * len(col_names)) + ')'
+    quoted_cols = ','.join(f'"{c}"' for c in col_names)
+    sql = f'INSERT INTO "{table}" ({quoted_cols}) VALUES ' + ','.join([ph] * len(rows))
+    flat = [v for row in rows for v in row]
+    conn.execute(sql, flat)
 
 
 def create_table(conn: sqlite3.Connection, table: str, columns: list):
     cols_sql = ', '.join([f'"{name}" {ctype}' for name, ctype in columns])
-    sql = f"DROP TABLE IF EXISTS \"{table}\"; CREATE TABLE \"{table}\" ({cols_sql});"
-    conn.executescript(sql)
+    # Plain execute() rather than executescript(): the latter would COMMIT the
+    # load transaction opened in main().
+    # Qualified with main so attached scratch databases are never touched.
+    conn.execute(f"DROP TABLE IF EXISTS main.\"{table}\"")
+    conn.execute(f"CREATE TABLE main.\"{table}\" ({cols_sql})")
+
+
+def create_indexes(conn: sqlite3.Connection, table: str, indexes: list):
+    for name, cols, unique in indexes:
+        cols_sql = ', '.join(f'"{c}"' for c in cols)
+        conn.execute(f'CREATE {"UNIQUE " if unique else ""}INDEX "{name}" ON "{table}" ({cols_sql})')
 
 
 def ingest_csv(conn: sqlite3.Connection, csv_path: str, schema: Dict):
     table = schema['table']
     columns = schema['columns']
     col_names = [c[0] for c in columns]
-    col_types = {c[0]: c[1] for c in columns}
 
     # Read CSV
     full_path = os.path.join(WORKDIR, csv_path)
@@ -113,51 +196,141 @@ def ingest_csv(conn: sqlite3.Connection, csv_path: str, schema: Dict):
         print(f"Warning: {full_path} not found, skipping.")
         return 0
 
+    placeholders = ','.join(['?'] * len(col_names))
+    quoted_cols = ','.join(f'"{c}"' for c in col_names)
+    insert_sql = f'INSERT INTO "{table}" ({quoted_cols}) VALUES ({placeholders})'
+
     with open(full_path, newline='', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        rows = []
-        for r in reader:
-            # Build row values in column order
-            vals = [convert_value(col_types[col], r.get(col, '').strip()) for col in col_names]
-            rows.append(tuple(vals))
-
-    if not rows:
-        return 0
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return 0
+        # Map schema columns to CSV positions; columns missing from the header
+        # read from a padding slot past the end of the row.
+        positions = [header.index(col) if col in header else len(header) for col in col_names]
+        width = max(positions) + 1
 
-    placeholders = ','.join(['?'] * len(col_names))
-    insert_sql = f'INSERT INTO "{table}" ({",".join(["\""+c+"\"" for c in col_names])}) VALUES ({placeholders})'
-    with conn:
-        conn.executemany(insert_sql, rows)
-    return len(rows)
+        if _fast_iter_batches is not None:
+            batches = _fast_iter_batches(reader, [(i, ctype) for i, (_, ctype) in zip(positions, columns)],
+                                         width, BATCH_SIZE)
+        else:
+            fields = [(i, CONVERTERS.get(ctype, _to_text)) for i, (_, ctype) in zip(positions, columns)]
 
+            def row_iter():
+                # Build row values in column order, streaming straight into executemany
+                for row in reader:
+                    if not row:
+                        continue
+                    if len(row) < width:
+                        row.extend([''] * (width - len(row)))
+                    yield tuple(conv(row[i].strip()) for i, conv in fields)
 
-def main():
-    # Remove existing DB (optional) -- we'll overwrite tables anyway
-    conn = sqlite3.connect(DB_PATH)
+            batches = chunked(row_iter(), BATCH_SIZE)
 
+        # No commit here: main() wraps the whole load in a single transaction.
+        count = 0
+        for batch in batches:
+            if len(batch) <= MULTI_ROW_MAX and len(batch) * len(col_names) <= MAX_VARIABLES:
+                multi_row_insert(conn, table, col_names, batch)
+            else:
+                conn.executemany(insert_sql, batch)
+            count += len(batch)
+    return count
+
+
+def tmp_db_path(table: str) -> str:
+    return os.path.join(WORKDIR, f'tmp_{table}.db')
+
+
+def load_one(item):
+    """Pool worker: load one CSV into its own scratch database.
+
+    Returns (table, scratch_db_path, row_count).
+    """
+    csv_file, schema = item
+    table = schema['table']
+    path = tmp_db_path(table)
+    if os.path.exists(path):
+        os.remove(path)
+    conn = sqlite3.connect(path, isolation_level=None)
+    # Scratch file: merged into DB_PATH and deleted afterwards, so skip durability.
+    conn.execute("PRAGMA journal_mode=OFF")
+    conn.execute("PRAGMA synchronous=OFF")
     try:
-        total = {}
-        # Create tables and ingest each CSV
-        for csv_file, schema in SCHEMAS.items():
-            print(f"Creating table '{schema['table']}' and loading from {csv_file}...")
-            create_table(conn, schema['table'], schema['columns'])
-            count = ingest_csv(conn, csv_file, schema)
-            print(f"Inserted {count} rows into {schema['table']}")
-            total[schema['table']] = count
-
-        # List tables and counts
-        cur = conn.cursor()
-        cur.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name")
-        tables = [r[0] for r in cur.fetchall()]
-        print('\nCreated tables:')
-        for t in tables:
-            cur.execute(f"SELECT COUNT(*) FROM \"{t}\"")
-            c = cur.fetchone()[0]
-            print(f" - {t}: {c} rows")
-
-        print(f"\nDatabase written to: {DB_PATH}")
+        conn.execute("BEGIN")
+        create_table(conn, table, schema['columns'])
+        count = ingest_csv(conn, csv_file, schema)
+        conn.execute("COMMIT")
     finally:
         conn.close()
+    return table, path, count
+
+
+def main():
+    # Load the CSVs in parallel, each into its own scratch DB; SQLite allows
+    # one writer per file, so separate files don't contend.
+    items = list(SCHEMAS.items())
+    try:
+        with Pool(min(len(items), os.cpu_count() or 1)) as pool:
+            results = pool.map(load_one, items)
+
+        # Merge into the existing DB_PATH; its tables are dropped and recreated below.
+        # Autocommit mode: the explicit BEGIN IMMEDIATE / COMMIT below is the only
+        # transaction, with no implicit BEGIN issued by the driver.
+        conn = sqlite3.connect(DB_PATH, isolation_level=None)
+        # Bulk-load pragmas: trade per-commit durability for throughput.
+        conn.execute("PRAGMA locking_mode=EXCLUSIVE")
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-65536")
+        conn.execute("PRAGMA cache_spill=0")
+
+        try:
+            # ATTACH is not allowed inside a transaction
+            for i, (_, path, _) in enumerate(results):
+                conn.execute(f"ATTACH DATABASE ? AS src{i}", (path,))
+
+            total = {}
+            # Create tables and merge each scratch DB inside one transaction
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for i, ((csv_file, schema), (table, _, count)) in enumerate(zip(items, results)):
+                    print(f"Creating table '{table}' and loading from {csv_file}...")
+                    create_table(conn, table, schema['columns'])
+                    conn.execute(f'INSERT INTO main."{table}" SELECT * FROM src{i}."{table}"')
+                    print(f"Inserted {count} rows into {table}")
+                    total[table] = count
+                # Build indexes once over the loaded tables rather than row by row
+                for schema in SCHEMAS.values():
+                    create_indexes(conn, schema['table'], schema.get('indexes', []))
+                conn.execute("COMMIT")
+            except Exception:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+
+            for i in range(len(results)):
+                conn.execute(f"DETACH DATABASE src{i}")
+
+            # List tables and counts
+            cur = conn.cursor()
+            cur.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name")
+            tables = [r[0] for r in cur.fetchall()]
+            print('\nCreated tables:')
+            for t in tables:
+                cur.execute(f"SELECT COUNT(*) FROM \"{t}\"")
+                c = cur.fetchone()[0]
+                print(f" - {t}: {c} rows")
+
+            print(f"\nDatabase written to: {DB_PATH}")
+        finally:
+            conn.close()
+    finally:
+        for _, schema in items:
+            path = tmp_db_path(schema['table'])
+            if os.path.exists(path):
+                os.remove(path)
 
 
 if __name__ == '__main__':
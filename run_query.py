@@ -17,13 +17,22 @@ PRODUCT_ID_CANDIDATES    = ["product_id", "id"]
 CUSTOMER_ID_CANDIDATES   = ["customer_id", "id"]
 QUANTITY_CANDIDATES      = ["quantity", "qty"]
 
-def get_tables(conn):
-    cur = conn.execute("SELECT name FROM sqlite_master WHERE type='table';")
-    return [r[0] for r in cur.fetchall()]
+# rows sampled by print_rows to size its columns
+WIDTH_SAMPLE_ROWS = 100
 
-def get_columns(conn, table):
-    cur = conn.execute(f"PRAGMA table_info({table});")
-    return [r[1] for r in cur.fetchall()]
+# introspection results from _introspect: {db file: (schema_version, schema)}
+_SCHEMA_CACHE = {}
+
+def get_columns_by_table(conn):
+    # one round-trip for every table's columns instead of a PRAGMA per table
+    cur = conn.execute(
+        "SELECT m.name, p.name FROM sqlite_master m "
+        "JOIN pragma_table_info(m.name) p WHERE m.type='table';"
+    )
+    cols_by_table = {}
+    for t, c in cur.fetchall():
+        cols_by_table.setdefault(t, []).append(c)
+    return cols_by_table
 
 def find_first_in(cols, candidates):
     for c in candidates:
@@ -31,8 +40,9 @@ def find_first_in(cols, candidates):
             return c
     return None
 
-def build_query(conn):
-    tables = get_tables(conn)
+def _introspect(conn):
+    cols_by_table = get_columns_by_table(conn)
+    tables = list(cols_by_table)
     tables_lower = [t.lower() for t in tables]
 
     # require at least customers and orders
@@ -52,11 +62,11 @@ def build_query(conn):
     t_order_items = find_table("order_items") if "order_items" in tables_lower else None
     t_reviews = find_table("reviews") if "reviews" in tables_lower else None
 
-    orders_cols = get_columns(conn, t_orders)
-    customers_cols = get_columns(conn, t_customers)
-    products_cols = get_columns(conn, t_products) if t_products else []
-    oi_cols = get_columns(conn, t_order_items) if t_order_items else []
-    reviews_cols = get_columns(conn, t_reviews) if t_reviews else []
+    orders_cols = cols_by_table[t_orders]
+    customers_cols = cols_by_table[t_customers]
+    products_cols = cols_by_table.get(t_products, [])
+    oi_cols = cols_by_table.get(t_order_items, [])
+    reviews_cols = cols_by_table.get(t_reviews, [])
 
     # choose id column names
     cust_id_col = find_first_in(customers_cols, CUSTOMER_ID_CANDIDATES) or customers_cols[0]
@@ -80,24 +90,91 @@ def build_query(conn):
     # review rating column
     rating_col = find_first_in(reviews_cols, REVIEW_RATING_CANDIDATES) if reviews_cols else None
 
-    # Build SQL based on what's available
+    return {
+        "tables": tables,
+        "t_customers": t_customers,
+        "t_orders": t_orders,
+        "t_products": t_products,
+        "t_order_items": t_order_items,
+        "t_reviews": t_reviews,
+        "cust_id_col": cust_id_col,
+        "order_id_col": order_id_col,
+        "product_id_col": product_id_col,
+        "product_name_col": product_name_col,
+        "quantity_col": quantity_col,
+        "subtotal_col": subtotal_col,
+        "order_total_col": order_total_col,
+        "rating_col": rating_col,
+    }
+
+def load_schema(conn):
+    """Resolved table/column names for build_query, cached per DB file and schema version."""
+    # Key on the connection's own database: schema_version lives in the file
+    # header and changes on every schema change, WAL mode included.
+    path = next((r[2] for r in conn.execute("PRAGMA database_list;") if r[1] == "main"), "")
+    if not path:
+        # in-memory / temporary databases have no stable identity to cache on
+        return _introspect(conn)
+    version = conn.execute("PRAGMA schema_version;").fetchone()[0]
+    cached = _SCHEMA_CACHE.get(path)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    schema = _introspect(conn)
+    _SCHEMA_CACHE[path] = (version, schema)
+    return schema
+
+def build_query(conn):
+    schema = load_schema(conn)
+    t_customers = schema["t_customers"]
+    t_orders = schema["t_orders"]
+    t_products = schema["t_products"]
+    t_order_items = schema["t_order_items"]
+    t_reviews = schema["t_reviews"]
+    cust_id_col = schema["cust_id_col"]
+    order_id_col = schema["order_id_col"]
+    product_id_col = schema["product_id_col"]
+    product_name_col = schema["product_name_col"]
+    quantity_col = schema["quantity_col"]
+    subtotal_col = schema["subtotal_col"]
+    order_total_col = schema["order_total_col"]
+    rating_col = schema["rating_col"]
+
+    # Build SQL based on what's available.
+    # The customer/order driver rows are limited in a CTE before the product and
+    # review lookups, and reviews are only joined when a rating column exists.
+    rating_expr = ('r.' + rating_col) if rating_col else 'NULL AS rating'
+    reviews_join = (f"LEFT JOIN {t_reviews} r ON r.customer_id = b.customer_id AND r.product_id = b.product_id"
+                    if rating_col else "")
+
     if t_order_items and product_name_col:
         # Best-case: order_items + products + reviews
         sql = f"""
+        WITH base AS (
+            SELECT
+                c.{cust_id_col} AS customer_id,
+                c.name AS customer_name,
+                o.{order_id_col} AS order_id,
+                o.order_date,
+                oi.product_id,
+                oi.{quantity_col or 'quantity'} AS quantity,
+                oi.{subtotal_col or 'subtotal'} AS subtotal
+            FROM {t_customers} c
+            JOIN {t_orders} o ON c.{cust_id_col} = o.customer_id
+            JOIN {t_order_items} oi ON o.{order_id_col} = oi.order_id
+            LIMIT 50
+        )
         SELECT
-            c.{cust_id_col} AS customer_id,
-            c.name AS customer_name,
+            b.customer_id,
+            b.customer_name,
             p.{product_name_col} AS product_name,
-            o.{order_id_col} AS order_id,
-            o.order_date,
-            oi.{quantity_col or 'quantity'} AS quantity,
-            oi.{subtotal_col or 'subtotal'} AS subtotal,
-            {('r.' + rating_col) if rating_col else 'NULL AS rating'}
-        FROM {t_customers} c
-        JOIN {t_orders} o ON c.{cust_id_col} = o.customer_id
-        JOIN {t_order_items} oi ON o.{order_id_col} = oi.order_id
-        LEFT JOIN {t_products} p ON oi.product_id = p.{product_id_col or 'product_id'}
-        LEFT JOIN {t_reviews} r ON r.customer_id = c.{cust_id_col} AND r.product_id = p.{product_id_col or 'product_id'}
+            b.order_id,
+            b.order_date,
+            b.quantity,
+            b.subtotal,
+            {rating_expr}
+        FROM base b
+        LEFT JOIN {t_products} p ON b.product_id = p.{product_id_col or 'product_id'}
+        {reviews_join}
         LIMIT 50;
         """
         return sql
@@ -107,19 +184,30 @@ def build_query(conn):
         qty = "1"
         subtotal_expr = f"o.{order_total_col}" if order_total_col else "o.total_amount"
         sql = f"""
+        WITH base AS (
+            SELECT
+                c.{cust_id_col} AS customer_id,
+                c.name AS customer_name,
+                o.{order_id_col} AS order_id,
+                o.order_date,
+                o.{product_id_col} AS product_id,
+                {subtotal_expr} AS subtotal
+            FROM {t_customers} c
+            JOIN {t_orders} o ON c.{cust_id_col} = o.customer_id
+            LIMIT 50
+        )
         SELECT
-            c.{cust_id_col} AS customer_id,
-            c.name AS customer_name,
+            b.customer_id,
+            b.customer_name,
             p.{product_name_col} AS product_name,
-            o.{order_id_col} AS order_id,
-            o.order_date,
+            b.order_id,
+            b.order_date,
             {qty} AS quantity,
-            {subtotal_expr} AS subtotal,
-            {('r.' + rating_col) if rating_col else 'NULL AS rating'}
-        FROM {t_customers} c
-        JOIN {t_orders} o ON c.{cust_id_col} = o.customer_id
-        LEFT JOIN {t_products} p ON o.{product_id_col} = p.{product_id_col}
-        LEFT JOIN {t_reviews} r ON r.customer_id = c.{cust_id_col} AND r.product_id = p.{product_id_col}
+            b.subtotal,
+            {rating_expr}
+        FROM base b
+        LEFT JOIN {t_products} p ON b.product_id = p.{product_id_col}
+        {reviews_join}
         LIMIT 50;
         """
         return sql
@@ -139,18 +227,19 @@ def build_query(conn):
     return sql
 
 def print_rows(headers, rows):
+    # size columns from a leading sample, then format every row in one pass
     widths = [len(h) for h in headers]
-    for r in rows:
+    for r in rows[:WIDTH_SAMPLE_ROWS]:
         for i, v in enumerate(r):
             s = "" if v is None else str(v)
             widths[i] = max(widths[i], len(s))
+    fmt = " | ".join("{:<%d}" % w for w in widths) + "\n"
+    write = sys.stdout.write
     # header
-    header_line = " | ".join(headers[i].ljust(widths[i]) for i in range(len(headers)))
-    sep = "-+-".join("-"*widths[i] for i in range(len(headers)))
-    print(header_line)
-    print(sep)
+    write(fmt.format(*headers))
+    write("-+-".join("-"*w for w in widths) + "\n")
     for r in rows:
-        print(" | ".join((("" if v is None else str(v)).ljust(widths[i])) for i, v in enumerate(r)))
+        write(fmt.format(*("" if v is None else str(v) for v in r)))
     print(f"\n{len(rows)} rows returned.\n")
 
 def main():
@@ -159,10 +248,11 @@ def main():
     conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row
     try:
-        print("Tables in database:", ", ".join(get_tables(conn)))
+        print("Tables in database:", ", ".join(load_schema(conn)["tables"]))
         sql = build_query(conn)
         print("\nExecuting query:\n" + "-"*60 + "\n" + sql.strip() + "\n" + "-"*60)
-        cur = conn.execute(sql)
+        cur = conn.cursor()
+        cur.execute(sql)
         rows = cur.fetchall()
         if not rows:
             print("Query returned 0 rows.")